@@ -22,10 +22,16 @@ from db import Base
 from db_models.task import Task
 target_metadata = Base.metadata
 
+import chunked_migrations
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
 # ... etc.
+chunked_migrations.configure(
+    batch_size=int(config.get_main_option("chunked_batch_size", "5000")),
+    pause=float(config.get_main_option("chunked_batch_pause", "0.01"))
+)
 
 
 def run_migrations_offline() -> None:
@@ -66,8 +72,13 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
+        # Chunked migrations commit as they go, so give every revision its
+        # own transaction and clear their progress once it is stamped.
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection,
+            target_metadata=target_metadata,
+            transaction_per_migration=True,
+            on_version_apply=chunked_migrations.clear_finished
         )
 
         with context.begin_transaction():
@@ -0,0 +1,83 @@
+"""store task.id as 16 byte binary uuid
+
+Revision ID: 3cdf62aca5a5
+Revises: bc779f9de5be
+Create Date: 2026-10-19 10:12:04.118532
+
+"""
+import uuid
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3cdf62aca5a5'
+down_revision: Union[str, Sequence[str], None] = 'bc779f9de5be'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COPY_BATCH_SIZE = 10000
+
+COLUMNS = [
+    'title',
+    'description',
+    'status',
+    'priority',
+    'is_deleted',
+    'created_at',
+    'updated_at',
+    'due_by'
+]
+
+
+def _task_columns():
+    return [
+        sa.Column('title', sa.String(length=64), nullable=False),
+        sa.Column('description', sa.String(length=255), nullable=False),
+        sa.Column('status', sa.String(length=64), nullable=False),
+        sa.Column('priority', sa.String(length=64), nullable=True),
+        sa.Column('is_deleted', sa.Boolean(), server_default=sa.text('0'), nullable=False),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+        sa.Column('due_by', sa.DateTime(), nullable=True),
+    ]
+
+
+def _copy_rows(convert_id) -> None:
+    bind = op.get_bind()
+    source = sa.table('task', sa.column('id'), *[sa.column(c) for c in COLUMNS])
+    target = sa.table('task_new', sa.column('id'), *[sa.column(c) for c in COLUMNS])
+    result = bind.execute(sa.select(source)).mappings()
+    while rows := result.fetchmany(COPY_BATCH_SIZE):
+        bind.execute(
+            target.insert(),
+            [{**row, 'id': convert_id(row['id'])} for row in rows]
+        )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('task_new',
+    sa.Column('id', sa.LargeBinary(length=16), nullable=False),
+    *_task_columns(),
+    sa.PrimaryKeyConstraint('id')
+    )
+    _copy_rows(lambda value: uuid.UUID(value).bytes)
+    op.drop_index(op.f('ix_task_id'), table_name='task')
+    op.drop_table('task')
+    op.rename_table('task_new', 'task')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_table('task_new',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    *_task_columns(),
+    sa.PrimaryKeyConstraint('id')
+    )
+    _copy_rows(lambda value: str(uuid.UUID(bytes=value)))
+    op.drop_table('task')
+    op.rename_table('task_new', 'task')
+    op.create_index(op.f('ix_task_id'), 'task', ['id'], unique=False)
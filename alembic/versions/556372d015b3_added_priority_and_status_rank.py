@@ -0,0 +1,52 @@
+"""added priority_rank and status_rank columns
+
+Revision ID: 556372d015b3
+Revises: 3cdf62aca5a5
+Create Date: 2026-10-19 11:02:37.540196
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from chunked_migrations import add_column, batched_backfill
+
+
+# revision identifiers, used by Alembic.
+revision: str = '556372d015b3'
+down_revision: Union[str, Sequence[str], None] = '3cdf62aca5a5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    add_column('task', sa.Column('priority_rank', sa.Integer(), nullable=True))
+    add_column('task', sa.Column('status_rank', sa.Integer(), nullable=True))
+    batched_backfill('task', {
+        'priority_rank': (
+            "CASE priority "
+            "WHEN 'urgent' THEN 0 WHEN 'high' THEN 1 WHEN 'medium' THEN 2 WHEN 'low' THEN 3 "
+            "ELSE 4 END"
+        ),
+        'status_rank': (
+            "CASE status "
+            "WHEN 'inprogress' THEN 0 WHEN 'pending' THEN 1 WHEN 'completed' THEN 2 "
+            "ELSE 3 END"
+        )
+    })
+    op.create_index(
+        'ix_task_priority_rank_status_rank_due_by',
+        'task',
+        ['priority_rank', 'status_rank', 'due_by'],
+        unique=False,
+        if_not_exists=True
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_task_priority_rank_status_rank_due_by', table_name='task')
+    op.drop_column('task', 'status_rank')
+    op.drop_column('task', 'priority_rank')
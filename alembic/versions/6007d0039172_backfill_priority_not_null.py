@@ -0,0 +1,81 @@
+"""backfill priority and make it not null
+
+Revision ID: 6007d0039172
+Revises: 556372d015b3
+Create Date: 2026-10-19 14:37:52.806413
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from chunked_migrations import batched_backfill, rebuild_table
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6007d0039172'
+down_revision: Union[str, Sequence[str], None] = '556372d015b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = [
+    'id',
+    'title',
+    'description',
+    'status',
+    'priority',
+    'is_deleted',
+    'created_at',
+    'updated_at',
+    'due_by',
+    'priority_rank',
+    'status_rank'
+]
+
+INDEXES = {
+    'ix_task_priority_rank_status_rank_due_by': ['priority_rank', 'status_rank', 'due_by']
+}
+
+
+def _task_columns(priority_nullable: bool) -> list[sa.Column]:
+    return [
+        sa.Column('id', sa.LargeBinary(length=16), nullable=False),
+        sa.Column('title', sa.String(length=64), nullable=False),
+        sa.Column('description', sa.String(length=255), nullable=False),
+        sa.Column('status', sa.String(length=64), nullable=False),
+        sa.Column('priority', sa.String(length=64), nullable=priority_nullable),
+        sa.Column('is_deleted', sa.Boolean(), server_default=sa.text('0'), nullable=False),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+        sa.Column('due_by', sa.DateTime(), nullable=True),
+        sa.Column('priority_rank', sa.Integer(), nullable=True),
+        sa.Column('status_rank', sa.Integer(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    ]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    batched_backfill(
+        'task',
+        {'priority': "'medium'", 'priority_rank': '2'},
+        where='priority IS NULL'
+    )
+    # Rows written between the backfill and the copy still get a priority
+    rebuild_table(
+        'task',
+        _task_columns(priority_nullable=False),
+        {column: column for column in COLUMNS} | {'priority': "COALESCE(priority, 'medium')"},
+        INDEXES
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    rebuild_table(
+        'task',
+        _task_columns(priority_nullable=True),
+        {column: column for column in COLUMNS},
+        INDEXES
+    )
@@ -0,0 +1,209 @@
+"""
+Agent turn benchmark: scripted to_do_agent turns run fully offline.
+
+A stub model stands in for Gemini and the repo's MCP server runs in
+memory, backed by the FastAPI app on a local port over a scratch SQLite
+database. Each turn prints the REPL's own report (time to first token,
+turn time, tokens, tool calls via MCP vs. cache). The script exits non-zero
+if any turn's tool calls don't match what the cache should produce.
+
+    python benchmarks/agent_turn.py --tasks 200
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+# DATABASE_URL is relative to the working directory
+os.chdir(tempfile.mkdtemp(prefix="todo-bench-"))
+
+import anyio
+import uvicorn
+from mcp.shared.memory import create_client_server_memory_streams
+from strands import Agent
+from strands.models.model import Model
+from strands.tools.executors import ConcurrentToolExecutor
+from strands.tools.mcp.mcp_client import MCPClient
+
+import to_do_agent
+from db import Base, connect_to_db, get_db_session
+from db_models.task import Task
+from main import app
+from mcp_server import server
+
+
+# (prompt, tool calls the model makes in one message, expected
+# (calls via MCP, calls from cache)). Turn 3 reads while it writes, so
+# turn 4 must not be answered from a result cached alongside the write.
+TURNS = [
+    (
+        "What's pending and what's done?",
+        [("get_tasks", {"status": "pending"}), ("get_tasks", {"status": "completed"})],
+        (2, 0)
+    ),
+    (
+        "Show me the pending ones again",
+        [("get_tasks", {"status": "pending"})],
+        (0, 1)
+    ),
+    (
+        "Add an urgent task to call the bank and list my urgent tasks",
+        [
+            ("get_tasks", {"priority": "urgent"}),
+            ("create_task", {"title": "call the bank", "description": "benchmark", "priority": "urgent"})
+        ],
+        (2, 0)
+    ),
+    (
+        "List my urgent tasks",
+        [("get_tasks", {"priority": "urgent"})],
+        (1, 0)
+    )
+]
+
+
+class StubModel(Model):
+    """
+    Scripted stand-in for GeminiModel. A user message gets the next turn's
+    tool calls, all in one response; tool results get a short streamed
+    reply.
+    """
+
+    def __init__(self, turns: list[list[tuple[str, dict]]], token_delay: float):
+        self.turns = iter(turns)
+        self.token_delay = token_delay
+
+    def update_config(self, **model_config):
+        pass
+
+    def get_config(self):
+        return {}
+
+    async def structured_output(self, output_model, prompt, system_prompt=None, **kwargs):
+        raise NotImplementedError
+
+    async def stream(self, messages, tool_specs=None, system_prompt=None, **kwargs):
+        yield {"messageStart": {"role": "assistant"}}
+        answered = any("toolResult" in block for block in messages[-1]["content"])
+        calls = [] if answered else next(self.turns)
+        for i, (name, tool_input) in enumerate(calls):
+            yield {"contentBlockStart": {"start": {"toolUse": {"toolUseId": f"{name}-{time.monotonic_ns()}-{i}", "name": name}}}}
+            yield {"contentBlockDelta": {"delta": {"toolUse": {"input": json.dumps(tool_input)}}}}
+            yield {"contentBlockStop": {}}
+        if calls:
+            yield {"messageStop": {"stopReason": "tool_use"}}
+        else:
+            for word in ("Here ", "you ", "go."):
+                await asyncio.sleep(self.token_delay)
+                yield {"contentBlockDelta": {"delta": {"text": word}}}
+            yield {"contentBlockStop": {}}
+            yield {"messageStop": {"stopReason": "end_turn"}}
+        yield {
+            "metadata": {
+                "usage": {"inputTokens": 100, "outputTokens": 10, "totalTokens": 110},
+                "metrics": {"latencyMs": 0}
+            }
+        }
+
+
+@asynccontextmanager
+async def in_memory_mcp_server():
+    """MCP transport connected to mcp_server.server running in the same loop"""
+    lowlevel = server.mcp._mcp_server
+    async with create_client_server_memory_streams() as (client_streams, server_streams):
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(
+                lambda: lowlevel.run(*server_streams, lowlevel.create_initialization_options())
+            )
+            yield client_streams
+            tg.cancel_scope.cancel()
+
+
+def seed(tasks: int) -> None:
+    engine = connect_to_db()
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    priorities = ["urgent", "high", "medium", "low"]
+    statuses = ["pending", "inprogress", "completed"]
+    # Deadlines well in the future keep the reminder scheduler idle
+    due_by = datetime.now() + timedelta(days=30)
+    db = get_db_session()
+    db.add_all(
+        Task(
+            title=f"task {i}",
+            description="benchmark",
+            priority=priorities[i % len(priorities)],
+            status=statuses[i % len(statuses)],
+            due_by=due_by
+        )
+        for i in range(tasks)
+    )
+    db.commit()
+    db.close()
+
+
+def start_api() -> uvicorn.Server:
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    api = uvicorn.Server(uvicorn.Config(app, log_level="warning"))
+    threading.Thread(target=api.run, kwargs={"sockets": [sock]}, daemon=True).start()
+    while not api.started:
+        time.sleep(0.01)
+    host, port = sock.getsockname()
+    server.FASTAPI_BASE_URL = f"http://{host}:{port}"
+    return api
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tasks", type=int, default=200)
+    parser.add_argument("--token-delay", type=float, default=0.05)
+    args = parser.parse_args()
+
+    seed(args.tasks)
+    api = start_api()
+    # The MCP server logs every request; keep the turn output readable
+    server.print = lambda *args, **kwargs: None
+    logging.getLogger().setLevel(logging.WARNING)
+
+    failures = []
+    with MCPClient(in_memory_mcp_server) as mcp_client:
+        cache = to_do_agent.ToolResultCache()
+        agent = Agent(
+            name="TodoAgent",
+            model=StubModel([calls for _, calls, _ in TURNS], args.token_delay),
+            system_prompt=to_do_agent.SYSTEM_PROMPT + to_do_agent.SNAPSHOT_PROMPT.format(
+                snapshot=to_do_agent.load_snapshot(mcp_client)
+            ),
+            tools=[to_do_agent.CachingTool(tool, cache) for tool in mcp_client.list_tools_sync()],
+            callback_handler=None,
+            tool_executor=ConcurrentToolExecutor()
+        )
+
+        with asyncio.Runner() as runner:
+            for prompt, _, expected in TURNS:
+                print(f"\n> {prompt}\n", end="")
+                runner.run(to_do_agent.run_turn(agent, prompt, cache))
+                if (cache.calls, cache.hits) != expected:
+                    failures.append(
+                        f"{prompt!r}: {cache.calls} via MCP, {cache.hits} from cache, "
+                        f"expected {expected[0]} via MCP, {expected[1]} from cache"
+                    )
+
+    api.should_exit = True
+    if failures:
+        sys.exit("\n" + "\n".join(failures))
+
+
+if __name__ == "__main__":
+    main()
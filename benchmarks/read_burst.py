@@ -0,0 +1,120 @@
+"""
+Read burst benchmark: identical concurrent GET /task requests with and
+without single-flight coalescing.
+
+Seeds `--tasks` rows into a scratch SQLite database, then fires `--burst`
+identical `GET /task?status=pending&priority=urgent` requests at once and
+reports wall time, p50/p99/max latency and how many queries actually ran.
+
+    python benchmarks/read_burst.py --tasks 20000 --burst 200
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+# DATABASE_URL is relative to the working directory
+os.chdir(tempfile.mkdtemp(prefix="todo-bench-"))
+
+import httpx
+
+from db import Base, connect_to_db, get_db_session
+from db_models.task import Task
+from main import app
+
+
+class NoCoalescing:
+    """Stand-in for SingleFlight that runs every request on its own"""
+
+    def __init__(self):
+        self.executions = 0
+        self.coalesced = 0
+
+    async def do(self, key, fn):
+        self.executions += 1
+        return await fn()
+
+
+def seed(tasks: int) -> None:
+    engine = connect_to_db()
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    priorities = ["urgent", "high", "medium", "low"]
+    statuses = ["pending", "inprogress", "completed"]
+    # Deadlines well in the future keep the reminder scheduler idle
+    due_by = datetime.now() + timedelta(days=30)
+    db = get_db_session()
+    db.add_all(
+        Task(
+            title=f"task {i}",
+            description="benchmark",
+            priority=priorities[i % len(priorities)],
+            status=statuses[i % len(statuses)],
+            due_by=due_by
+        )
+        for i in range(tasks)
+    )
+    db.commit()
+    db.close()
+
+
+async def run(coalesce: bool, burst: int) -> dict:
+    latencies: list[float] = []
+    async with app.router.lifespan_context(app):
+        if not coalesce:
+            app.state.single_flight = NoCoalescing()
+        flights = app.state.single_flight
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+            async def one():
+                start = time.perf_counter()
+                response = await client.get(
+                    "/task",
+                    params={"status": "pending", "priority": "urgent"}
+                )
+                latencies.append(time.perf_counter() - start)
+                response.raise_for_status()
+
+            start = time.perf_counter()
+            await asyncio.gather(*(one() for _ in range(burst)))
+            elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "mode": "single-flight" if coalesce else "uncoalesced",
+        "wall_ms": elapsed * 1000,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "max_ms": latencies[-1] * 1000,
+        "queries": flights.executions
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tasks", type=int, default=20000)
+    parser.add_argument("--burst", type=int, default=200)
+    args = parser.parse_args()
+
+    seed(args.tasks)
+    for coalesce in (False, True):
+        result = asyncio.run(run(coalesce, args.burst))
+        print(
+            f"{result['mode']:<14} "
+            f"wall {result['wall_ms']:8.1f} ms  "
+            f"p50 {result['p50_ms']:8.1f} ms  "
+            f"p99 {result['p99_ms']:8.1f} ms  "
+            f"max {result['max_ms']:8.1f} ms  "
+            f"queries {result['queries']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Task storage benchmark: 36 character text id + ix_task_id vs. 16 byte
+binary id (revision 3cdf62aca5a5).
+
+Inserts `--rows` tasks into a scratch SQLite file for each layout and
+reports the insert rate and resulting database size.
+
+    python benchmarks/task_storage.py --rows 1000000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    Index,
+    MetaData,
+    String,
+    Table,
+    create_engine,
+    text
+)
+
+from db_models.task import BinaryUUID
+
+
+BATCH_SIZE = 10000
+
+legacy_metadata = MetaData()
+legacy_task = Table(
+    "task",
+    legacy_metadata,
+    Column("id", String(36), primary_key=True),
+    Column("title", String(64), nullable=False),
+    Column("description", String(255), nullable=False),
+    Column("status", String(64), nullable=False),
+    Column("priority", String(64)),
+    Column("is_deleted", Boolean, server_default=text("0"), nullable=False),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+    Column("due_by", DateTime),
+    Index("ix_task_id", "id")
+)
+
+# Pinned to the layout of revision 3cdf62aca5a5 so later schema changes
+# to Task don't leak into the comparison
+binary_metadata = MetaData()
+binary_task = Table(
+    "task",
+    binary_metadata,
+    Column("id", BinaryUUID, primary_key=True),
+    Column("title", String(64), nullable=False),
+    Column("description", String(255), nullable=False),
+    Column("status", String(64), nullable=False),
+    Column("priority", String(64)),
+    Column("is_deleted", Boolean, server_default=text("0"), nullable=False),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+    Column("due_by", DateTime)
+)
+
+
+def run(name: str, table: Table, rows: int, workdir: str) -> None:
+    path = os.path.join(workdir, f"{name}.db")
+    engine = create_engine(f"sqlite:///{path}")
+    table.metadata.create_all(engine, tables=[table])
+
+    now = datetime.now()
+    start = time.perf_counter()
+    with engine.begin() as conn:
+        for offset in range(0, rows, BATCH_SIZE):
+            conn.execute(table.insert(), [
+                {
+                    "id": str(uuid.uuid4()),
+                    "title": f"task {i}",
+                    "description": "benchmark",
+                    "status": "pending",
+                    "priority": "medium",
+                    "is_deleted": False,
+                    "created_at": now,
+                    "updated_at": now,
+                    "due_by": now
+                }
+                for i in range(offset, min(offset + BATCH_SIZE, rows))
+            ])
+    elapsed = time.perf_counter() - start
+    engine.dispose()
+
+    size_mb = os.path.getsize(path) / (1024 * 1024)
+    print(f"{name:<8} {rows / elapsed:10.0f} rows/s  {size_mb:8.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="todo-bench-")
+    run("text", legacy_task, args.rows, workdir)
+    run("binary", binary_task, args.rows, workdir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Write path benchmark: per-request commit vs. group commit (WriteBatcher).
+
+Fires `--requests` POST /task calls with `--concurrency` in flight against
+a scratch SQLite database and reports throughput, p50/p99 latency and the
+number of failed requests (per-request commits contend for SQLite's write
+lock and fail with "database is locked" once the busy timeout expires).
+
+The per-request path runs its DB work synchronously on the event loop,
+so its p99 mostly measures event-loop stalls, not fsync cost: a contended
+INSERT blocks every request for the busy timeout (BUSY_TIMEOUT here
+rather than pysqlite's 5s), and above ~15 in flight, checking a
+connection out of the engine's pool blocks for up to 30s. Keep
+`--concurrency` well below that or the per-request run does not finish.
+
+Before timing anything it checks that batched writes to the same row each
+get their own result back: two PATCHes of one task plus a failing PATCH
+are sent in one batch, and the script exits non-zero if a response
+carries another request's title or the failure breaks the others.
+
+    python benchmarks/write_path.py --requests 500 --concurrency 8
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+# DATABASE_URL is relative to the working directory
+os.chdir(tempfile.mkdtemp(prefix="todo-bench-"))
+
+import httpx
+
+import db
+from db import Base, connect_to_db
+
+# Bound the per-request run's lock waits; set before main creates the engine
+BUSY_TIMEOUT = 0.1
+db.DATABASE_URL = f"{db.DATABASE_URL}?timeout={BUSY_TIMEOUT}"
+
+from main import app
+from write_batcher import WriteBatcher
+
+
+def reset_db() -> None:
+    engine = connect_to_db()
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+
+
+async def check_same_row_batch() -> list[str]:
+    reset_db()
+    failures = []
+    async with app.router.lifespan_context(app):
+        # A generous delay so the three PATCHes share a batch
+        app.state.write_batcher = WriteBatcher(max_delay=0.1)
+        app.state.write_batcher.start()
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            created = await client.post("/task", json={
+                "title": "check",
+                "description": "benchmark",
+                "priority": "high"
+            })
+            url = f"/task/{created.json()['id']}"
+            first, second, failing = await asyncio.gather(
+                client.patch(url, json={"title": "X"}),
+                client.patch(url, json={"title": "Y"}),
+                client.patch(url, json={"status": None})
+            )
+        await app.state.write_batcher.stop()
+        del app.state.write_batcher
+
+    for response, title in ((first, "X"), (second, "Y")):
+        if response.status_code != 200:
+            failures.append(f"PATCH title={title}: HTTP {response.status_code}")
+        elif response.json()["title"] != title:
+            failures.append(f"PATCH title={title}: got title {response.json()['title']!r}")
+    if failing.status_code == 200:
+        failures.append("PATCH status=null: unexpectedly succeeded")
+    return failures
+
+
+async def run(batched: bool, requests: int, concurrency: int) -> dict:
+    reset_db()
+
+    latencies: list[float] = []
+    errors = 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with app.router.lifespan_context(app):
+        if batched:
+            app.state.write_batcher = WriteBatcher()
+            app.state.write_batcher.start()
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+            async def one(i: int):
+                nonlocal errors
+                async with semaphore:
+                    start = time.perf_counter()
+                    response = await client.post("/task", json={
+                        "title": f"task {i}",
+                        "description": "benchmark",
+                        "priority": "high"
+                    })
+                    latencies.append(time.perf_counter() - start)
+                    if response.status_code != 200:
+                        errors += 1
+
+            start = time.perf_counter()
+            await asyncio.gather(*(one(i) for i in range(requests)))
+            elapsed = time.perf_counter() - start
+        if batched:
+            await app.state.write_batcher.stop()
+            del app.state.write_batcher
+
+    latencies.sort()
+    return {
+        "mode": "group commit" if batched else "per-request commit",
+        "throughput": requests / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "errors": errors
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    failures = asyncio.run(check_same_row_batch())
+    if failures:
+        sys.exit("Batched writes to one row:\n" + "\n".join(failures))
+
+    for batched in (False, True):
+        result = asyncio.run(run(batched, args.requests, args.concurrency))
+        print(
+            f"{result['mode']:<20} "
+            f"{result['throughput']:8.1f} req/s  "
+            f"p50 {result['p50_ms']:7.2f} ms  "
+            f"p99 {result['p99_ms']:7.2f} ms  "
+            f"errors {result['errors']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+"""
+Chunked, resumable data migrations for SQLite.
+
+SQLite holds a single write lock, so a table rebuild or backfill done as
+one statement blocks every writer until it finishes. The helpers here
+walk the table by rowid range instead, committing each batch in its own
+short transaction so application writes can interleave. Progress is
+recorded in `_migration_progress` inside the same transaction as each
+batch, so a crashed migration picks up from the last committed batch
+when it is re-run.
+
+The helpers are called from a migration's upgrade()/downgrade();
+alembic/env.py configures the batch size and pause from alembic.ini and
+registers clear_finished to drop progress rows once a revision is
+stamped.
+"""
+import logging
+import time
+from contextlib import contextmanager
+
+from alembic import context, op
+import sqlalchemy as sa
+from sqlalchemy.engine import Connection
+
+
+BATCH_SIZE = 5000
+BATCH_PAUSE = 0.01
+PROGRESS_TABLE = "_migration_progress"
+
+logger = logging.getLogger("alembic.chunked")
+
+
+def configure(batch_size: int | None = None, pause: float | None = None) -> None:
+    """Set the rows per batch and the pause between batches (seconds)"""
+    global BATCH_SIZE, BATCH_PAUSE
+    if batch_size is not None:
+        BATCH_SIZE = batch_size
+    if pause is not None:
+        BATCH_PAUSE = pause
+
+
+@contextmanager
+def _batch(conn: Connection):
+    # Take the write lock up front so a batch never fails half way
+    # through upgrading a read lock.
+    conn.exec_driver_sql("BEGIN IMMEDIATE")
+    try:
+        yield
+    except Exception:
+        conn.exec_driver_sql("ROLLBACK")
+        raise
+    conn.exec_driver_sql("COMMIT")
+
+
+def _progress_key(kind: str, table: str, detail: str) -> str:
+    revision = context.get_context().get_current_revision()
+    return f"{kind}:{table}:{detail}@{revision}"
+
+
+def _load_progress(conn: Connection, key: str) -> tuple[int, bool]:
+    conn.exec_driver_sql(
+        f"CREATE TABLE IF NOT EXISTS {PROGRESS_TABLE} ("
+        "name VARCHAR(255) PRIMARY KEY, "
+        "last_rowid INTEGER NOT NULL, "
+        "done BOOLEAN NOT NULL DEFAULT 0)"
+    )
+    row = conn.exec_driver_sql(
+        f"SELECT last_rowid, done FROM {PROGRESS_TABLE} WHERE name = ?",
+        (key,)
+    ).first()
+    if row is None:
+        return 0, False
+    return row[0], bool(row[1])
+
+
+def _save_progress(conn: Connection, key: str, last_rowid: int, done: bool = False) -> None:
+    conn.exec_driver_sql(
+        f"INSERT OR REPLACE INTO {PROGRESS_TABLE} (name, last_rowid, done) VALUES (?, ?, ?)",
+        (key, last_rowid, int(done))
+    )
+
+
+def _index_table(conn: Connection, name: str) -> str | None:
+    return conn.exec_driver_sql(
+        "SELECT tbl_name FROM sqlite_master WHERE type = 'index' AND name = ?",
+        (name,)
+    ).scalar()
+
+
+def add_column(table: str, column: sa.Column) -> None:
+    """
+    op.add_column that is a no-op if `column` already exists. A backfill
+    commits the schema changes made before it, so a migration resumed
+    after a crash finds its new columns already in place.
+    """
+    if not context.is_offline_mode():
+        existing = sa.inspect(op.get_bind()).get_columns(table)
+        if any(c["name"] == column.name for c in existing):
+            return
+    op.add_column(table, column)
+
+
+def clear_finished(ctx, step, heads, run_args) -> None:
+    """
+    `on_version_apply` hook: forget finished operations once the revision
+    that ran them is stamped, so a later downgrade/upgrade runs them again.
+    """
+    conn = ctx.connection
+    exists = conn.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+        (PROGRESS_TABLE,)
+    ).scalar()
+    if exists:
+        conn.exec_driver_sql(f"DELETE FROM {PROGRESS_TABLE} WHERE done = 1")
+
+
+def _walk_rowids(conn: Connection, key: str, table: str, last_rowid: int, step) -> int:
+    """Call step(lo, hi) for each rowid range of `table`, one batch per transaction"""
+    max_rowid = conn.exec_driver_sql(
+        f"SELECT COALESCE(MAX(rowid), 0) FROM {table}"
+    ).scalar()
+    if last_rowid:
+        logger.info("%s: resuming after rowid %d", key, last_rowid)
+    while last_rowid < max_rowid:
+        high = min(last_rowid + BATCH_SIZE, max_rowid)
+        with _batch(conn):
+            step(last_rowid, high)
+            _save_progress(conn, key, high)
+        last_rowid = high
+        logger.info(
+            "%s: %d/%d rowids (%.0f%%)",
+            key, last_rowid, max_rowid, 100 * last_rowid / max_rowid
+        )
+        time.sleep(BATCH_PAUSE)
+    return last_rowid
+
+
+def batched_backfill(table: str, values: dict[str, str], where: str | None = None) -> None:
+    """
+    UPDATE `table` SET column = sql_expression for each entry of `values`,
+    optionally limited to rows matching the SQL `where` clause, in rowid
+    batches.
+    """
+    assignments = ", ".join(f"{column} = {expr}" for column, expr in values.items())
+    if context.is_offline_mode():
+        op.execute(f"UPDATE {table} SET {assignments}" + (f" WHERE {where}" if where else ""))
+        return
+
+    condition = f" AND ({where})" if where else ""
+    key = _progress_key("backfill", table, ",".join(values))
+    with op.get_context().autocommit_block():
+        conn = op.get_bind()
+        last_rowid, done = _load_progress(conn, key)
+        if done:
+            return
+
+        def step(low: int, high: int) -> None:
+            conn.exec_driver_sql(
+                f"UPDATE {table} SET {assignments} "
+                f"WHERE rowid > ? AND rowid <= ?{condition}",
+                (low, high)
+            )
+
+        last_rowid = _walk_rowids(conn, key, table, last_rowid, step)
+        with _batch(conn):
+            _save_progress(conn, key, last_rowid, done=True)
+
+
+def rebuild_table(
+    table: str,
+    columns: list[sa.Column],
+    copy: dict[str, str],
+    indexes: dict[str, list[str]] | None = None
+) -> None:
+    """
+    Rebuild `table` with a new set of `columns` without holding the write
+    lock for the whole copy.
+
+    `copy` maps each new column name to an SQL expression over the old
+    row. Triggers keep the new table in step with writes to the old one
+    while the rows are copied across in rowid batches; the switch-over is
+    a DROP plus RENAME in one short transaction. `indexes` (name ->
+    columns) are built on the new table before copying; an index of the
+    same name on the old table is dropped first, so it is unavailable to
+    readers for the duration of the copy.
+    """
+    if context.is_offline_mode():
+        raise RuntimeError("rebuild_table needs a live connection (online mode)")
+
+    new_table = f"{table}__new"
+    key = _progress_key("rebuild", table, new_table)
+    column_names = ", ".join(copy)
+    expressions = ", ".join(copy.values())
+    copy_rows = (
+        f"INSERT OR REPLACE INTO {new_table} (rowid, {column_names}) "
+        f"SELECT rowid, {expressions} FROM {table}"
+    )
+
+    with op.get_context().autocommit_block():
+        conn = op.get_bind()
+        last_rowid, done = _load_progress(conn, key)
+        if done:
+            return
+
+        with _batch(conn):
+            op.create_table(new_table, *columns, if_not_exists=True)
+            for name, index_columns in (indexes or {}).items():
+                if _index_table(conn, name) == table:
+                    op.drop_index(name, table_name=table)
+                op.create_index(name, new_table, index_columns, if_not_exists=True)
+            conn.exec_driver_sql(
+                f"CREATE TRIGGER IF NOT EXISTS {new_table}_insert AFTER INSERT ON {table} "
+                f"BEGIN {copy_rows} WHERE rowid = NEW.rowid; END"
+            )
+            conn.exec_driver_sql(
+                f"CREATE TRIGGER IF NOT EXISTS {new_table}_update AFTER UPDATE ON {table} "
+                f"BEGIN DELETE FROM {new_table} WHERE rowid = OLD.rowid; "
+                f"{copy_rows} WHERE rowid = NEW.rowid; END"
+            )
+            conn.exec_driver_sql(
+                f"CREATE TRIGGER IF NOT EXISTS {new_table}_delete AFTER DELETE ON {table} "
+                f"BEGIN DELETE FROM {new_table} WHERE rowid = OLD.rowid; END"
+            )
+
+        def step(low: int, high: int) -> None:
+            conn.exec_driver_sql(f"{copy_rows} WHERE rowid > ? AND rowid <= ?", (low, high))
+
+        last_rowid = _walk_rowids(conn, key, table, last_rowid, step)
+
+        # Dropping the old table also drops its triggers and indexes
+        with _batch(conn):
+            conn.exec_driver_sql(f"DROP TABLE {table}")
+            conn.exec_driver_sql(f"ALTER TABLE {new_table} RENAME TO {table}")
+            _save_progress(conn, key, last_rowid, done=True)
+        logger.info("%s: switched over", key)
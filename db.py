@@ -1,5 +1,5 @@
 from fastapi import Request
-from sqlalchemy import create_engine, Engine
+from sqlalchemy import create_engine, event, Engine
 from sqlalchemy.orm import declarative_base, sessionmaker
 
 DATABASE_URL = "sqlite:///./todo.db"
@@ -14,6 +14,17 @@ def connect_to_db() -> Engine:
         db_engine = create_engine(
             url=DATABASE_URL
         )
+
+        # pysqlite only emits BEGIN lazily before DML, which breaks
+        # SAVEPOINT handling; take over transaction control so nested
+        # transactions (used by the write batcher) behave correctly.
+        @event.listens_for(db_engine, "connect")
+        def _disable_pysqlite_autobegin(dbapi_connection, connection_record):
+            dbapi_connection.isolation_level = None
+
+        @event.listens_for(db_engine, "begin")
+        def _emit_begin(conn):
+            conn.exec_driver_sql("BEGIN")
     return db_engine
 
 
@@ -5,19 +5,72 @@ from sqlalchemy import (
     DateTime,
     func,
     Boolean,
+    Index,
+    Integer,
+    LargeBinary,
+    TypeDecorator,
     text
 )
 
+from sqlalchemy.orm import validates
+
 from db import Base
 
 
+# Lower rank = more urgent, so "most urgent first, soonest due" is a plain
+# forward scan of ix_task_priority_rank_status_rank_due_by.
+PRIORITY_RANKS = {
+    "urgent": 0,
+    "high": 1,
+    "medium": 2,
+    "low": 3
+}
+STATUS_RANKS = {
+    "inprogress": 0,
+    "pending": 1,
+    "completed": 2
+}
+
+
+class BinaryUUID(TypeDecorator):
+    """
+    Stores a UUID string as its 16 raw bytes.
+
+    Python code (and the HTTP API) keeps seeing the canonical 36 character
+    string; only the stored key shrinks.
+    """
+    impl = LargeBinary(16)
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        try:
+            return uuid.UUID(str(value)).bytes
+        except ValueError:
+            # Not a UUID, so it can never match a stored 16 byte key
+            return b""
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return str(uuid.UUID(bytes=value))
+
+
 class Task(Base):
     __tablename__ = "task"
+    __table_args__ = (
+        Index(
+            "ix_task_priority_rank_status_rank_due_by",
+            "priority_rank",
+            "status_rank",
+            "due_by"
+        ),
+    )
 
     id = Column(
-        String(36),
+        BinaryUUID,
         primary_key=True,
-        index=True,
         default=lambda: str(uuid.uuid4())
     )
     title = Column(
@@ -57,3 +110,23 @@ class Task(Base):
         server_default=text("DATE('now')"),
         nullable=True
     )
+    priority_rank = Column(
+        Integer,
+        nullable=True
+    )
+    status_rank = Column(
+        Integer,
+        nullable=True
+    )
+
+    @validates("priority")
+    def _set_priority_rank(self, key, value):
+        value = getattr(value, "value", value)
+        self.priority_rank = PRIORITY_RANKS.get(value, len(PRIORITY_RANKS))
+        return value
+
+    @validates("status")
+    def _set_status_rank(self, key, value):
+        value = getattr(value, "value", value)
+        self.status_rank = STATUS_RANKS.get(value, len(STATUS_RANKS))
+        return value
@@ -1,3 +1,5 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
 from routers import task
@@ -7,10 +9,29 @@ from db import (
     db_engine
 )
 from transaction_middleware import db_txn_middleware
+from reminder_scheduler import ReminderScheduler
+from single_flight import SingleFlight
+from write_batcher import WriteBatcher, WRITE_BATCHING_ENABLED
 
 
 db_engine = connect_to_db()
-app = FastAPI(title="To Do List App")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.reminder_scheduler = ReminderScheduler()
+    await app.state.reminder_scheduler.start()
+    app.state.single_flight = SingleFlight()
+    if WRITE_BATCHING_ENABLED:
+        app.state.write_batcher = WriteBatcher()
+        app.state.write_batcher.start()
+    yield
+    if WRITE_BATCHING_ENABLED:
+        await app.state.write_batcher.stop()
+    await app.state.reminder_scheduler.stop()
+
+
+app = FastAPI(title="To Do List App", lifespan=lifespan)
 app.middleware("http")(db_txn_middleware)
 app.include_router(task.router)
 
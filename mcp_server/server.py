@@ -106,8 +106,8 @@ async def get_tasks(
         "description": description,
         "status": status,
         "priority": priority,
-        "due_by_from": due_date_from,
-        "due_by_to": due_date_to,
+        "due_date_from": due_date_from,
+        "due_date_to": due_date_to,
         "sort_by": sort_by,
         "sort_order": sort_order,
         "limit": limit
@@ -134,6 +134,32 @@ async def get_tasks(
     
     return f">>> Found {len(result)} task(s):\n\n" + "\n\n".join(task_list)
 
+@mcp.tool()
+async def get_task_snapshot(limit: int = 50) -> str:
+    """
+    Compact overview of the task list, most urgent first, one line per task.
+
+    Args:
+        limit: Maximum number of tasks to include
+
+    Returns:
+        Lines of the form 'id | status | priority | due by | title'
+    """
+    result = await make_api_request(
+        "GET",
+        "/task",
+        params={"sort_by": "priority", "limit": limit}
+    )
+
+    if not result:
+        return "No tasks."
+
+    return "\n".join(
+        f"{task['id']} | {task['status']} | {task['priority']} | "
+        f"{task.get('due_by') or '-'} | {task['title']}"
+        for task in result
+    )
+
 @mcp.tool()
 async def get_task_by_id(task_id: str) -> str:
     """
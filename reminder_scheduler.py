@@ -0,0 +1,275 @@
+import asyncio
+import heapq
+import logging
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable
+
+import httpx
+from fastapi import Request
+
+from db import get_db_session
+from db_models.task import Task
+from http_models.task import TaskResponse
+
+
+REMINDER_LEAD_TIME = timedelta(minutes=30)
+# Bound on the number of ids re-checked per IN (...) query
+RECHECK_CHUNK_SIZE = 500
+# Delay before retrying events whose firing failed (e.g. database locked)
+FIRE_RETRY_DELAY = timedelta(seconds=5)
+
+logger = logging.getLogger(__name__)
+
+
+class ReminderEvent:
+    """A reminder or overdue notification for a single task."""
+
+    REMINDER = "reminder"
+    OVERDUE = "overdue"
+
+    def __init__(self, kind: str, task_id: str, title: str, due_by: datetime):
+        self.kind = kind
+        self.task_id = task_id
+        self.title = title
+        self.due_by = due_by
+
+    def to_dict(self) -> dict:
+        return {
+            "kind": self.kind,
+            "task_id": self.task_id,
+            "title": self.title,
+            "due_by": self.due_by.isoformat()
+        }
+
+
+ReminderSink = Callable[[ReminderEvent], Awaitable[None]]
+
+
+async def log_sink(event: ReminderEvent) -> None:
+    """Default sink, writes the event to the application log"""
+    logger.info(
+        "Task %s is %s: '%s' due by %s",
+        event.task_id,
+        "due soon" if event.kind == ReminderEvent.REMINDER else "overdue",
+        event.title,
+        event.due_by.isoformat()
+    )
+
+
+class WebhookSink:
+    """Posts each event as JSON to `url` (e.g. an MCP server endpoint)"""
+
+    def __init__(self, url: str):
+        self.url = url
+        self._client: httpx.AsyncClient | None = None
+
+    async def __call__(self, event: ReminderEvent) -> None:
+        if self._client is None:
+            self._client = httpx.AsyncClient()
+        response = await self._client.post(self.url, json=event.to_dict())
+        response.raise_for_status()
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+class ReminderScheduler:
+    """
+    Fires reminder and overdue events for open tasks at their deadline.
+
+    Deadlines live in a min-heap keyed on fire time, so scheduling and
+    cancelling are O(log n) and the loop sleeps until the next entry is due
+    instead of polling the table. Entries are never removed from the heap
+    directly: `_deadlines` holds the current `due_by` for every scheduled
+    task and stale heap entries are skipped when they are popped.
+
+    `_overdue_sent` remembers the deadline each task was last reported
+    overdue for, so later writes that leave `due_by` unchanged do not
+    report it again. Deadlines already past when the scheduler starts are
+    treated as reported, so restarts do not repeat old notifications.
+    """
+
+    def __init__(
+        self,
+        sink: ReminderSink = log_sink,
+        lead_time: timedelta = REMINDER_LEAD_TIME
+    ):
+        self.sink = sink
+        self.lead_time = lead_time
+        self._heap: list[tuple[datetime, int, str, str, datetime]] = []
+        self._deadlines: dict[str, datetime] = {}
+        self._overdue_sent: dict[str, datetime] = {}
+        self._counter = 0
+        self._wakeup = asyncio.Event()
+        self._runner: asyncio.Task | None = None
+
+    @staticmethod
+    def _query_deadlines() -> list[tuple[str, datetime]]:
+        db = get_db_session()
+        try:
+            return db.query(
+                Task.id,
+                Task.due_by
+            ).filter(
+                Task.is_deleted == False,
+                Task.status != "completed",
+                Task.due_by.isnot(None)
+            ).all()
+        finally:
+            db.close()
+
+    async def load(self) -> int:
+        """Populate the heap with every open task that has a deadline"""
+        rows = await asyncio.to_thread(self._query_deadlines)
+        now = datetime.now()
+        for task_id, due_by in rows:
+            if due_by <= now:
+                self._overdue_sent[task_id] = due_by
+            else:
+                self.schedule(task_id, due_by)
+        return len(rows)
+
+    def schedule(self, task_id: str, due_by: datetime | None) -> None:
+        """Schedule (or reschedule) the events for a task"""
+        if due_by is None:
+            self.cancel(task_id)
+            return
+        if (
+            self._deadlines.get(task_id) == due_by
+            or self._overdue_sent.get(task_id) == due_by
+        ):
+            return
+        self._deadlines[task_id] = due_by
+        now = datetime.now()
+        reminder_at = due_by - self.lead_time
+        if reminder_at > now:
+            self._push(reminder_at, ReminderEvent.REMINDER, task_id, due_by)
+        self._push(due_by, ReminderEvent.OVERDUE, task_id, due_by)
+        self._wakeup.set()
+
+    def cancel(self, task_id: str) -> None:
+        """Drop any pending events for a task"""
+        self._deadlines.pop(task_id, None)
+        self._overdue_sent.pop(task_id, None)
+
+    def sync_task(self, task: Task | TaskResponse) -> None:
+        """Bring the schedule in line with a task after a write"""
+        if task.is_deleted or task.status == "completed":
+            self.cancel(task.id)
+        else:
+            self.schedule(task.id, task.due_by)
+
+    def _push(self, fire_at: datetime, kind: str, task_id: str, due_by: datetime) -> None:
+        self._counter += 1
+        heapq.heappush(self._heap, (fire_at, self._counter, kind, task_id, due_by))
+
+    def _pop_due(self, now: datetime) -> list[tuple[str, str, datetime]]:
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            _, _, kind, task_id, due_by = heapq.heappop(self._heap)
+            if self._deadlines.get(task_id) != due_by:
+                continue
+            if kind == ReminderEvent.OVERDUE:
+                del self._deadlines[task_id]
+                self._overdue_sent[task_id] = due_by
+            due.append((kind, task_id, due_by))
+        return due
+
+    def _retry(self, due: list[tuple[str, str, datetime]]) -> None:
+        """Put entries popped for a failed firing back on the heap"""
+        retry_at = datetime.now() + FIRE_RETRY_DELAY
+        for kind, task_id, due_by in due:
+            if kind == ReminderEvent.OVERDUE:
+                # Undo _pop_due, unless a write rescheduled the task meanwhile
+                if task_id in self._deadlines or self._overdue_sent.get(task_id) != due_by:
+                    continue
+                del self._overdue_sent[task_id]
+                self._deadlines[task_id] = due_by
+            elif self._deadlines.get(task_id) != due_by:
+                continue
+            self._push(retry_at, kind, task_id, due_by)
+
+    @staticmethod
+    def _query_tasks(task_ids: list[str]) -> dict[str, Task]:
+        db = get_db_session()
+        try:
+            tasks = {}
+            for i in range(0, len(task_ids), RECHECK_CHUNK_SIZE):
+                chunk = task_ids[i:i + RECHECK_CHUNK_SIZE]
+                for task in db.query(Task).filter(Task.id.in_(chunk)):
+                    tasks[task.id] = task
+            return tasks
+        finally:
+            db.close()
+
+    async def _notify(self, event: ReminderEvent) -> None:
+        try:
+            await self.sink(event)
+        except Exception:
+            logger.exception("Reminder sink failed for task %s", event.task_id)
+
+    async def _fire(self, due: list[tuple[str, str, datetime]]) -> None:
+        # The writes that scheduled these entries may have been rolled
+        # back, so confirm against the database before notifying anyone.
+        tasks = await asyncio.to_thread(
+            self._query_tasks,
+            list({task_id for _, task_id, _ in due})
+        )
+        events = []
+        for kind, task_id, due_by in due:
+            task = tasks.get(task_id)
+            if (
+                not task
+                or task.is_deleted
+                or task.status == "completed"
+                or task.due_by != due_by
+            ):
+                continue
+            events.append(ReminderEvent(kind, task.id, task.title, due_by))
+        await asyncio.gather(*(self._notify(event) for event in events))
+
+    async def run(self) -> None:
+        while True:
+            self._wakeup.clear()
+            due = self._pop_due(datetime.now())
+            if due:
+                try:
+                    await self._fire(due)
+                except Exception:
+                    logger.exception(
+                        "Failed to fire %d reminder event(s), retrying in %s",
+                        len(due), FIRE_RETRY_DELAY
+                    )
+                    self._retry(due)
+            timeout = None
+            if self._heap:
+                timeout = max((self._heap[0][0] - datetime.now()).total_seconds(), 0)
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def start(self) -> None:
+        count = await self.load()
+        logger.info("Reminder scheduler loaded %d deadline(s)", count)
+        self._runner = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self._runner:
+            self._runner.cancel()
+            try:
+                await self._runner
+            except asyncio.CancelledError:
+                pass
+            self._runner = None
+        close = getattr(self.sink, "aclose", None)
+        if close:
+            await close()
+
+
+def get_reminder_scheduler_for_request(
+    request: Request
+) -> ReminderScheduler:
+    return request.app.state.reminder_scheduler
@@ -1,9 +1,25 @@
+import asyncio
 from typing import Optional
 from datetime import datetime, time
 
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import lambda_stmt, select
 from sqlalchemy.orm import Session
-from db import get_db_session_for_request
+from db import get_db_session, get_db_session_for_request
+from transaction_middleware import get_after_commit_for_request
+from reminder_scheduler import (
+    ReminderScheduler,
+    get_reminder_scheduler_for_request
+)
+from single_flight import (
+    SingleFlight,
+    get_single_flight_for_request
+)
+from write_batcher import (
+    WriteBatcher,
+    get_write_batcher_for_request,
+    run_write
+)
 
 from http_models.task import (
     TaskResponse,
@@ -16,9 +32,29 @@ from db_models.task import Task
 
 router = APIRouter()
 
+SORT_COLUMNS = {
+    "created_at": (Task.created_at,),
+    "updated_at": (Task.updated_at,),
+    "due_by": (Task.due_by,),
+    "title": (Task.title,),
+    "status": (Task.status,),
+    "priority": (Task.priority_rank, Task.status_rank, Task.due_by)
+}
+
+# (sort_by, ascending) -> ORDER BY clauses. Priority ranks count up from
+# most urgent, so "desc" (most urgent first) walks
+# ix_task_priority_rank_status_rank_due_by forwards.
+SORT_ORDERS = {
+    (sort_by, ascending): tuple(
+        column.asc() if ascending != (sort_by == "priority") else column.desc()
+        for column in columns
+    )
+    for sort_by, columns in SORT_COLUMNS.items()
+    for ascending in (True, False)
+}
+
 @router.get("/task", response_model=list[TaskResponse])
 async def get_all_tasks(
-    db: Session = Depends(get_db_session_for_request),
     search: Optional[str] = None,
     title: Optional[str] = None,
     description: Optional[str] = None,
@@ -29,50 +65,94 @@ async def get_all_tasks(
     sort_by: Optional[str] = "created_at",
     sort_order: Optional[str] = "desc",
     limit: Optional[int] = None,
-    offset: Optional[int] = 0
+    offset: Optional[int] = 0,
+    flights: SingleFlight = Depends(get_single_flight_for_request)
 ):
-    query = db.query(Task).filter(Task.is_deleted == False)
-    
+    stmt = lambda_stmt(lambda: select(Task).where(Task.is_deleted == False))
+
+    # Each filter is its own lambda so SQLAlchemy caches one compiled
+    # statement per combination of active filters; the values themselves
+    # are extracted from the closures as bound parameters.
     if search:
-        query = query.filter((Task.title.ilike(f"%{search}%")) | (Task.description.ilike(f"%{search}%")))
+        search_pattern = f"%{search}%"
+        stmt += lambda s: s.where(
+            Task.title.ilike(search_pattern) | Task.description.ilike(search_pattern)
+        )
     if title:
-        query = query.filter(Task.title.ilike(f"%{title}%"))
+        title_pattern = f"%{title}%"
+        stmt += lambda s: s.where(Task.title.ilike(title_pattern))
+    if description:
+        description_pattern = f"%{description}%"
+        stmt += lambda s: s.where(Task.description.ilike(description_pattern))
     if status:
-        query = query.filter(Task.status == status)
+        stmt += lambda s: s.where(Task.status == status)
     if priority:
-        query = query.filter(Task.priority == priority)
+        stmt += lambda s: s.where(Task.priority == priority)
     if due_date_from:
-        query = query.filter(Task.due_date >= due_date_from)
+        stmt += lambda s: s.where(Task.due_by >= due_date_from)
     if due_date_to:
-        query = query.filter(Task.due_date <= due_date_to)
-    
-    if sort_by and hasattr(Task, sort_by):
-        query = query.order_by(
-            getattr(Task, sort_by).asc() if sort_order == "asc" 
-            else getattr(Task, sort_by).desc()
-        )
-    
-    return query.offset(offset).limit(limit).all() if limit else query.offset(offset).all()
+        stmt += lambda s: s.where(Task.due_by <= due_date_to)
+
+    if sort_by:
+        if sort_by not in SORT_COLUMNS:
+            raise HTTPException(status_code=400, detail=f"Cannot sort by '{sort_by}'")
+        order_by = SORT_ORDERS[sort_by, sort_order == "asc"]
+        stmt += lambda s: s.order_by(*order_by)
+
+    if offset:
+        stmt += lambda s: s.offset(offset)
+    if limit:
+        stmt += lambda s: s.limit(limit)
+
+    key = (
+        "list", search, title, description, status, priority,
+        due_date_from, due_date_to, sort_by, sort_order == "asc",
+        offset or 0, limit or None
+    )
+
+    # The flight can outlive the request that started it (504, client
+    # disconnect), so it runs on its own session rather than the request's.
+    def query() -> list[TaskResponse]:
+        db = get_db_session()
+        try:
+            return [
+                TaskResponse.model_validate(task, from_attributes=True)
+                for task in db.execute(stmt).scalars()
+            ]
+        finally:
+            db.close()
+
+    return await flights.do(key, lambda: asyncio.to_thread(query))
 
 @router.get("/task/{id}", response_model=TaskResponse)
 async def get_task_by_id(
     id: str,
-    db: Session = Depends(get_db_session_for_request)
+    flights: SingleFlight = Depends(get_single_flight_for_request)
 ):
-    task = db.query(
-        Task
-    ).filter(
-        Task.id == id,
-        Task.is_deleted == False
-    ).first()
-    if not task:
-        raise HTTPException(status_code=404, detail="Task not found")
-    return task
+    def query() -> TaskResponse:
+        db = get_db_session()
+        try:
+            task = db.query(
+                Task
+            ).filter(
+                Task.id == id,
+                Task.is_deleted == False
+            ).first()
+            if not task:
+                raise HTTPException(status_code=404, detail="Task not found")
+            return TaskResponse.model_validate(task, from_attributes=True)
+        finally:
+            db.close()
+
+    return await flights.do(("task", id), lambda: asyncio.to_thread(query))
 
 @router.post("/task", response_model=TaskResponse)
 async def create_task(
     payload: CreateTask,
-    db: Session = Depends(get_db_session_for_request)
+    db: Session = Depends(get_db_session_for_request),
+    reminders: ReminderScheduler = Depends(get_reminder_scheduler_for_request),
+    batcher: WriteBatcher | None = Depends(get_write_batcher_for_request),
+    after_commit: list = Depends(get_after_commit_for_request)
 ):
     eod_today = payload.due_by
     if not eod_today:
@@ -86,61 +166,80 @@ async def create_task(
     allowed_status = ["completed", "inprogress", "pending"]
     status = payload.status if payload.status in allowed_status else "pending"
 
-    task = Task(
-        title=payload.title,
-        description=payload.description,
-        due_by=eod_today,
-        status=status,
-        priority=priority # urgent, high, medium, low
-    )
-    try:
+    def op(db: Session) -> TaskResponse:
+        task = Task(
+            title=payload.title,
+            description=payload.description,
+            due_by=eod_today,
+            status=status,
+            priority=priority # urgent, high, medium, low
+        )
         db.add(task)
         db.flush()
         db.refresh(task)
-        return task
-    except:
-        raise
+        return TaskResponse.model_validate(task, from_attributes=True)
+
+    task = await run_write(op, db, batcher)
+    after_commit.append(lambda: reminders.sync_task(task))
+    return task
 
 @router.patch("/task/{id}", response_model=TaskResponse)
 async def update_task(
     id: str,
     payload: Updatetask,
-    db: Session = Depends(get_db_session_for_request)
+    db: Session = Depends(get_db_session_for_request),
+    reminders: ReminderScheduler = Depends(get_reminder_scheduler_for_request),
+    batcher: WriteBatcher | None = Depends(get_write_batcher_for_request),
+    after_commit: list = Depends(get_after_commit_for_request)
 ):
-    task: Task | None = db.query(
-        Task
-    ).filter(
-        Task.id==id
-    ).first()
     update_data = payload.dict(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(task, key, value)
 
-    db.flush()
-    db.refresh(task)
+    def op(db: Session) -> TaskResponse:
+        task: Task | None = db.query(
+            Task
+        ).filter(
+            Task.id==id
+        ).first()
+        for key, value in update_data.items():
+            setattr(task, key, value)
+
+        db.flush()
+        db.refresh(task)
+        return TaskResponse.model_validate(task, from_attributes=True)
+
+    task = await run_write(op, db, batcher)
+    after_commit.append(lambda: reminders.sync_task(task))
     return task
 
 
 @router.delete("/task/{id}", response_model=DeleteTask)
 async def delete_task(
     id: str,
-    db: Session = Depends(get_db_session_for_request)
+    db: Session = Depends(get_db_session_for_request),
+    reminders: ReminderScheduler = Depends(get_reminder_scheduler_for_request),
+    batcher: WriteBatcher | None = Depends(get_write_batcher_for_request),
+    after_commit: list = Depends(get_after_commit_for_request)
 ):
-    task: Task = db.query(
-        Task
-    ).filter(
-        Task.id==id,
-        Task.is_deleted==False
-    ).first()
-    if not task:
-        raise HTTPException(status_code=404, detail="Task not found")
-    update_data = {
-        "id": id,
-        "is_deleted": True
-    }
-    for key, value in update_data.items():
-        setattr(task, key, value)
-
-    db.flush()
-    db.refresh(task)
+    def op(db: Session) -> DeleteTask:
+        task: Task = db.query(
+            Task
+        ).filter(
+            Task.id==id,
+            Task.is_deleted==False
+        ).first()
+        if not task:
+            raise HTTPException(status_code=404, detail="Task not found")
+        update_data = {
+            "id": id,
+            "is_deleted": True
+        }
+        for key, value in update_data.items():
+            setattr(task, key, value)
+
+        db.flush()
+        db.refresh(task)
+        return DeleteTask.model_validate(task, from_attributes=True)
+
+    task = await run_write(op, db, batcher)
+    after_commit.append(lambda: reminders.cancel(task.id))
     return task
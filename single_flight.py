@@ -0,0 +1,70 @@
+import asyncio
+import os
+from typing import Any, Awaitable, Callable, Hashable
+
+from fastapi import HTTPException, Request
+
+
+SINGLE_FLIGHT_TIMEOUT = float(os.getenv("TODO_SINGLE_FLIGHT_TIMEOUT_MS", "5000")) / 1000
+
+
+class SingleFlight:
+    """
+    Coalesces identical concurrent reads.
+
+    The first caller for a key starts the work and every caller that
+    arrives while it is in flight awaits the same future, so N identical
+    requests cost one query. Results and exceptions are delivered to all
+    waiters alike. Each waiter gives up after `timeout` seconds (or the
+    timeout passed to do() for that key); a flight that overruns its
+    timeout is also forgotten so later callers start a fresh execution
+    instead of queueing behind a stuck one. The transaction middleware
+    calls forget_all() after each write commits so later reads don't join
+    a flight that started before the write.
+    """
+
+    def __init__(self, timeout: float = SINGLE_FLIGHT_TIMEOUT):
+        self.timeout = timeout
+        self.executions = 0
+        self.coalesced = 0
+        self._flights: dict[Hashable, asyncio.Future] = {}
+
+    async def do(
+        self,
+        key: Hashable,
+        fn: Callable[[], Awaitable[Any]],
+        timeout: float | None = None
+    ) -> Any:
+        future = self._flights.get(key)
+        if future is None:
+            self.executions += 1
+            future = asyncio.ensure_future(fn())
+            future.add_done_callback(lambda f: self._finish(key, f))
+            self._flights[key] = future
+        else:
+            self.coalesced += 1
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), timeout or self.timeout)
+        except asyncio.TimeoutError:
+            self._forget(key, future)
+            raise HTTPException(status_code=504, detail="Timed out waiting for the database")
+
+    def forget_all(self) -> None:
+        """Detach every in-flight read; callers already waiting still get its result"""
+        self._flights.clear()
+
+    def _forget(self, key: Hashable, future: asyncio.Future) -> None:
+        if self._flights.get(key) is future:
+            del self._flights[key]
+
+    def _finish(self, key: Hashable, future: asyncio.Future) -> None:
+        self._forget(key, future)
+        # Mark the exception as retrieved in case every waiter timed out
+        if not future.cancelled():
+            future.exception()
+
+
+def get_single_flight_for_request(
+    request: Request
+) -> SingleFlight:
+    return request.app.state.single_flight
@@ -1,7 +1,22 @@
+import asyncio
+import json
+import time
+from typing import Any
+
 from mcp.client.streamable_http import streamablehttp_client
 from strands.tools.mcp.mcp_client import MCPClient
 from strands import Agent
 from strands.models.gemini import GeminiModel
+from strands.tools.executors import ConcurrentToolExecutor
+from strands.types.tools import AgentTool, ToolGenerator, ToolSpec, ToolUse
+
+
+# Prefetch a compact task list into the system prompt at session start
+PREFETCH_SNAPSHOT = True
+SNAPSHOT_LIMIT = 50
+
+READ_ONLY_TOOLS = {"get_tasks", "get_task_by_id", "get_task_snapshot"}
+MUTATING_TOOLS = {"create_task", "update_task", "delete_task"}
 
 
 SYSTEM_PROMPT = """You are a helpful todo list assistant. You help users manage their tasks efficiently.
@@ -24,6 +39,170 @@ Guidelines:
 - Do Not show ID to User
 """
 
+SNAPSHOT_PROMPT = """
+Snapshot of the task list taken at session start (id | status | priority | due by | title).
+Use it to answer questions and resolve task IDs without calling tools; call get_tasks once tasks have changed:
+{snapshot}
+"""
+
+
+class ToolResultCache:
+    """
+    Session-scoped cache of read-only MCP tool results. `generation` is
+    bumped on every clear() so a read that overlapped a mutating call can
+    tell its result may already be stale.
+    """
+
+    def __init__(self):
+        self.results: dict[tuple[str, str], dict] = {}
+        self.generation = 0
+        self.hits = 0
+        self.calls = 0
+
+    def key(self, tool_name: str, tool_input: Any) -> tuple[str, str]:
+        return tool_name, json.dumps(tool_input, sort_keys=True, default=str)
+
+    def clear(self):
+        self.results.clear()
+        self.generation += 1
+
+    def reset_counters(self):
+        self.hits = 0
+        self.calls = 0
+
+
+class CachingTool(AgentTool):
+    """
+    Wraps an MCP tool so repeated read-only calls with the same arguments
+    are answered from the session cache, and any mutating call empties it.
+    """
+
+    def __init__(self, tool: AgentTool, cache: ToolResultCache):
+        super().__init__()
+        self.tool = tool
+        self.cache = cache
+
+    @property
+    def tool_name(self) -> str:
+        return self.tool.tool_name
+
+    @property
+    def tool_spec(self) -> ToolSpec:
+        return self.tool.tool_spec
+
+    @property
+    def tool_type(self) -> str:
+        return self.tool.tool_type
+
+    async def stream(self, tool_use: ToolUse, invocation_state: dict[str, Any], **kwargs: Any) -> ToolGenerator:
+        cacheable = self.tool_name in READ_ONLY_TOOLS
+        key = self.cache.key(self.tool_name, tool_use["input"])
+        if cacheable and key in self.cache.results:
+            self.cache.hits += 1
+            yield {**self.cache.results[key], "toolUseId": tool_use["toolUseId"]}
+            return
+
+        self.cache.calls += 1
+        mutating = self.tool_name in MUTATING_TOOLS
+        if mutating:
+            self.cache.clear()
+        generation = self.cache.generation
+        event = None
+        async for event in self.tool.stream(tool_use, invocation_state, **kwargs):
+            pass
+        result = getattr(event, "tool_result", event)
+        if mutating:
+            # Reads that ran alongside this call (ConcurrentToolExecutor)
+            # may have been answered before the write landed
+            self.cache.clear()
+        elif cacheable and result.get("status") == "success" and self.cache.generation == generation:
+            self.cache.results[key] = result
+        yield result
+
+
+def load_snapshot(mcp_client: MCPClient) -> str:
+    """Fetch the compact task snapshot used to seed the system prompt"""
+    result = mcp_client.call_tool_sync(
+        tool_use_id="session-snapshot",
+        name="get_task_snapshot",
+        arguments={"limit": SNAPSHOT_LIMIT}
+    )
+    return "\n".join(
+        block["text"] for block in result["content"] if "text" in block
+    )
+
+
+def format_turn_report(
+    elapsed: float,
+    first_token: float | None,
+    usage_before: dict,
+    usage_after: dict,
+    cache: ToolResultCache
+) -> str:
+    input_tokens = usage_after["inputTokens"] - usage_before["inputTokens"]
+    output_tokens = usage_after["outputTokens"] - usage_before["outputTokens"]
+    ttft = f"{first_token:.2f}s" if first_token is not None else "-"
+    return (
+        f"[first token {ttft} | turn {elapsed:.2f}s | "
+        f"tokens in {input_tokens} out {output_tokens} | "
+        f"tool calls {cache.calls} via MCP, {cache.hits} from cache]"
+    )
+
+
+async def run_turn(agent: Agent, user_input: str, cache: ToolResultCache) -> None:
+    """Stream one agent turn to the terminal and print its timing report"""
+    cache.reset_counters()
+    usage_before = dict(agent.event_loop_metrics.accumulated_usage)
+    start = time.perf_counter()
+    first_token = None
+    async for event in agent.stream_async(user_input):
+        if "data" in event:
+            if first_token is None:
+                first_token = time.perf_counter() - start
+            print(event["data"], end="", flush=True)
+    elapsed = time.perf_counter() - start
+    print()
+    print(format_turn_report(
+        elapsed,
+        first_token,
+        usage_before,
+        agent.event_loop_metrics.accumulated_usage,
+        cache
+    ))
+
+
+def repl(agent: Agent, cache: ToolResultCache) -> None:
+    """Read prompts until the user exits, streaming each response"""
+    # One event loop for the whole session. input() runs between turns,
+    # outside the loop, so Ctrl-C at the prompt raises KeyboardInterrupt
+    # straight away; during a turn Runner.run cancels the turn and raises
+    # KeyboardInterrupt once it has unwound.
+    with asyncio.Runner() as runner:
+        while True:
+            try:
+                user_input = input("\n👤 You: ").strip()
+
+                if not user_input:
+                    continue
+
+                if user_input.lower() in ['exit']:
+                    print("\n Goodbye! Your tasks are saved.")
+                    break
+
+                print("\n Agent: ", end="", flush=True)
+                runner.run(run_turn(agent, user_input, cache))
+
+            except EOFError:
+                print("\n Goodbye! Your tasks are saved.")
+                break
+            except KeyboardInterrupt:
+                print("\n\n Keyborad Interrupt.....")
+                break
+            except Exception as e:
+                print(f"\n Error: {str(e)}")
+                print("Please try again or type 'quit' to exit.")
+
+
 def main():
     """Main function to run the todo agent"""
     
@@ -58,15 +237,26 @@ def main():
     
     with streamable_http_mcp_client as mcp_client:
         
-        tools = mcp_client.list_tools_sync()
+        cache = ToolResultCache()
+        tools = [
+            CachingTool(tool, cache)
+            for tool in mcp_client.list_tools_sync()
+        ]
         print(f"Connected to MCP server")
         print(f"Available tools: {[tool.tool_name for tool in tools]}\n")
+
+        if PREFETCH_SNAPSHOT:
+            system_prompt += SNAPSHOT_PROMPT.format(snapshot=load_snapshot(mcp_client))
         
         agent = Agent(
             name="TodoAgent",
             model=model,
             system_prompt=system_prompt,
-            tools=tools
+            tools=tools,
+            # Stream through run_turn instead of the default printing handler
+            callback_handler=None,
+            # Independent tool calls from one model response run in parallel
+            tool_executor=ConcurrentToolExecutor()
         )
         
         print("Agent initialized successfully!\n")
@@ -79,28 +269,7 @@ def main():
         print("\nType 'exit' or 'quit' to stop.\n")
         print("=" * 60)
         
-        while True:
-            try:
-                user_input = input("\n👤 You: ").strip()
-                
-                if not user_input:
-                    continue
-                
-                if user_input.lower() in ['exit']:
-                    print("\n Goodbye! Your tasks are saved.")
-                    break
-                
-                print("\n Agent: ", end="", flush=True)
-                
-                response = agent(user_input)                
-                print(response)
-                
-            except KeyboardInterrupt:
-                print("\n\n Keyborad Interrupt.....")
-                break
-            except Exception as e:
-                print(f"\n Error: {str(e)}")
-                print("Please try again or type 'quit' to exit.")
+        repl(agent, cache)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
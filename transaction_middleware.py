@@ -5,18 +5,35 @@ from sqlalchemy.orm import Session
 from db import get_db_session
 
 
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
 async def db_txn_middleware(
     request: Request,
     call_next: Callable
 ):
     db_session: Session = get_db_session()
     request.state.db_session = db_session
+    request.state.after_commit = []
     try:
         response = await call_next(request)
         db_session.commit()
+        for callback in request.state.after_commit:
+            callback()
+        if request.method not in SAFE_METHODS:
+            # Reads that started before this write committed may return
+            # old rows; don't let later reads join them.
+            request.app.state.single_flight.forget_all()
         return response
     except Exception as e:
         db_session.rollback()
         raise e
     finally:
         db_session.close()
+
+
+def get_after_commit_for_request(
+    request: Request
+) -> list[Callable[[], None]]:
+    """Callbacks to run once the request's transaction has committed"""
+    return request.state.after_commit
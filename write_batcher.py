@@ -0,0 +1,135 @@
+import asyncio
+import logging
+import os
+from typing import Any, Callable
+
+from fastapi import Request
+from sqlalchemy.orm import Session, sessionmaker
+
+from db import connect_to_db
+
+
+WRITE_BATCHING_ENABLED = os.getenv("TODO_WRITE_BATCHING", "0") == "1"
+WRITE_BATCH_MAX_SIZE = int(os.getenv("TODO_WRITE_BATCH_MAX_SIZE", "64"))
+WRITE_BATCH_MAX_DELAY = float(os.getenv("TODO_WRITE_BATCH_MAX_DELAY_MS", "5")) / 1000
+
+logger = logging.getLogger(__name__)
+
+# Ops in a batch share one session, so an op must return a snapshot
+# (e.g. a response model) rather than an ORM instance: a later op in the
+# same batch could change the instance, and a failed op's SAVEPOINT
+# rollback expires it.
+WriteOp = Callable[[Session], Any]
+
+
+class WriteBatcher:
+    """
+    Group-commits concurrent write operations.
+
+    Each queued operation runs inside its own SAVEPOINT so a failure only
+    rolls back that operation, and the whole batch is committed with a
+    single transaction (one fsync) once `max_size` operations are queued or
+    `max_delay` seconds have passed since the first one arrived.
+    """
+
+    def __init__(
+        self,
+        max_size: int = WRITE_BATCH_MAX_SIZE,
+        max_delay: float = WRITE_BATCH_MAX_DELAY
+    ):
+        self.max_size = max_size
+        self.max_delay = max_delay
+        self._queue: asyncio.Queue[tuple[WriteOp, asyncio.Future]] = asyncio.Queue()
+        self._session_local = sessionmaker(
+            bind=connect_to_db(),
+            autocommit=False,
+            autoflush=False,
+            expire_on_commit=False
+        )
+        self._runner: asyncio.Task | None = None
+
+    async def submit(self, op: WriteOp) -> Any:
+        """Queue `op` and wait for the batch containing it to commit"""
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((op, future))
+        return await future
+
+    async def _collect(self) -> list[tuple[WriteOp, asyncio.Future]]:
+        batch = [await self._queue.get()]
+        deadline = asyncio.get_running_loop().time() + self.max_delay
+        while len(batch) < self.max_size:
+            timeout = deadline - asyncio.get_running_loop().time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    def _execute(self, ops: list[WriteOp]) -> list[tuple[bool, Any]]:
+        db = self._session_local()
+        outcomes = []
+        try:
+            for op in ops:
+                savepoint = db.begin_nested()
+                try:
+                    result = op(db)
+                    savepoint.commit()
+                    outcomes.append((True, result))
+                except Exception as e:
+                    savepoint.rollback()
+                    outcomes.append((False, e))
+            db.commit()
+            return outcomes
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    async def run(self) -> None:
+        while True:
+            batch = await self._collect()
+            ops = [op for op, _ in batch]
+            try:
+                outcomes = await asyncio.to_thread(self._execute, ops)
+            except Exception as e:
+                logger.exception("Write batch of %d failed to commit", len(batch))
+                outcomes = [(False, e)] * len(batch)
+            for (_, future), (ok, value) in zip(batch, outcomes):
+                if future.done():
+                    continue
+                if ok:
+                    future.set_result(value)
+                else:
+                    future.set_exception(value)
+
+    def start(self) -> None:
+        self._runner = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self._runner:
+            self._runner.cancel()
+            try:
+                await self._runner
+            except asyncio.CancelledError:
+                pass
+            self._runner = None
+
+
+def get_write_batcher_for_request(
+    request: Request
+) -> WriteBatcher | None:
+    return getattr(request.app.state, "write_batcher", None)
+
+
+async def run_write(
+    op: WriteOp,
+    db: Session,
+    batcher: WriteBatcher | None
+) -> Any:
+    """Run `op` through the batcher if enabled, else on the request session"""
+    if batcher is None:
+        return op(db)
+    return await batcher.submit(op)